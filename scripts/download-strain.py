@@ -6,31 +6,82 @@ Fetches HDF5 strain files, extracts bandpassed strain per detector,
 converts to Float32Array .bin files with a JSON manifest.
 
 Output:
-  public/strain/{eventName}/{detector}.bin
+  public/strain/{eventName}/{detector}.bin       (or .bin.zst with --compress zstd)
   public/strain/manifest.json
 
 Usage:
   python3 scripts/download-strain.py              # all events
   python3 scripts/download-strain.py GW150914      # single event
   python3 scripts/download-strain.py --list        # list available events
+  python3 scripts/download-strain.py --workers 2   # fewer parallel downloads
+
+Options:
+  --workers N        HDF5 downloads in flight at once, capped at --per-host
+                     since every file comes from one host (default --per-host)
+  --per-host N       connections per host (default 4)
+  --sample-rate HZ   strain sample rate to fetch (default 4096)
+  --duration S       strain segment length in seconds (default 32)
+  --compress zstd    write zstd-compressed .bin.zst files (default none)
+
+Each HDF5 file is held in memory while its strain is extracted, once per
+download in flight. That is a few MB at the defaults, but long segments
+(e.g. --duration 4096) need hundreds of MB each.
+
+Requires: aiohttp, h5py, numpy, requests, tqdm
+Optional: orjson (faster JSON parsing and manifest writing),
+          zstandard (--compress zstd)
 """
 
+import argparse
+import asyncio
+import hashlib
+import io
 import json
 import os
+import shutil
+import signal
 import sys
-import tempfile
-import urllib.request
-import urllib.error
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
+import aiohttp
 import h5py
 import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Only needed for --compress zstd
+    zstandard = None
 
 GWOSC_API = "https://gwosc.org/eventapi/json/allevents/"
-OUTPUT_DIR = Path(__file__).resolve().parent.parent / "public" / "strain"
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = ROOT / "public" / "strain"
+CACHE_DIR = ROOT / ".cache" / "gwosc" / "detail"  # Outside public/ so it isn't deployed
+CACHE_TTL = 7 * 24 * 3600  # Seconds before a cached event detail is re-fetched
+DETAIL_TIMEOUT = 30  # Seconds to connect / between reads for event-detail JSON
+HTTP_RETRIES = 5     # Retries for transient GWOSC failures, with backoff
+RETRY_BACKOFF = 0.5  # Seconds; doubles on each retry
+RETRY_STATUSES = [502, 503, 504]
 SAMPLE_RATE = 4096  # We use 4 kHz files (smaller, sufficient for visualization)
 DURATION = 32       # Standard GWOSC event data segment duration
 DETECTORS = ["H1", "L1", "V1"]
+_DETECTOR_SET = frozenset(DETECTORS)  # For membership tests
+USER_AGENT = "WarpLab/1.0"
+PER_HOST = 4        # Default connections per host, and HDF5 downloads in flight
+MANIFEST_FLUSH_EVERY = 10  # Save the manifest after every N processed events
+COMPRESSION = "none"  # Output compression: "none" or "zstd"
+ZSTD_LEVEL = 9
 
 # Catalog priority: later catalogs have better data
 CATALOG_PRIORITY = {
@@ -45,12 +96,130 @@ CATALOG_PRIORITY = {
     "O4_Discovery_Papers": 9,
 }
 
+# One keep-alive connection pool shared by every request (and every worker
+# thread), so each GWOSC round-trip doesn't pay for a fresh TCP+TLS handshake.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT
+
+
+def configure_session(connections: int) -> None:
+    """Mount the HTTPS connection pool, capped at `connections` per host."""
+    _SESSION.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=connections,
+            pool_block=True,
+            max_retries=Retry(
+                total=HTTP_RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+            ),
+        ),
+    )
+
+
+configure_session(PER_HOST)
+
+
+def json_loads(data: bytes) -> dict:
+    """Parse JSON from bytes (with orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: dict) -> bytes:
+    """Serialize to indented, key-sorted JSON bytes (with orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True).encode()
+
 
 def fetch_json(url: str) -> dict:
     """Fetch JSON from a URL."""
-    req = urllib.request.Request(url, headers={"User-Agent": "WarpLab/1.0"})
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode())
+    resp = _SESSION.get(url, timeout=30)
+    resp.raise_for_status()
+    return json_loads(resp.content)
+
+
+# In-process memo of afetch_json() fetches, keyed by URL. Holds the task
+# rather than its result, so concurrent callers share one in-flight fetch
+_JSON_TASKS: dict[str, "asyncio.Task[dict]"] = {}
+# Number of callers currently awaiting each fetch task
+_JSON_WAITERS: dict["asyncio.Task[dict]", int] = {}
+
+
+async def afetch_json(
+    session: aiohttp.ClientSession, url: str, limit: asyncio.Semaphore
+) -> dict:
+    """
+    Fetch JSON from a URL on an aiohttp session, with at most `limit`
+    requests in flight.
+    Responses are memoized in-process and cached on disk for CACHE_TTL.
+    """
+    task = _JSON_TASKS.get(url)
+    if task is None:
+        task = asyncio.ensure_future(_afetch_json_cached(session, url, limit))
+        task.add_done_callback(lambda t: _forget_failed_fetch(url, t))
+        _JSON_TASKS[url] = task
+
+    # A caller giving up must not cancel the fetch for everyone else, but
+    # once the last one gives up nobody needs it: cancel it so it doesn't
+    # hold a connection slot (no-op if the fetch already finished)
+    _JSON_WAITERS[task] = _JSON_WAITERS.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _JSON_WAITERS[task] -= 1
+        if not _JSON_WAITERS[task]:
+            del _JSON_WAITERS[task]
+            if not task.done():
+                if _JSON_TASKS.get(url) is task:
+                    del _JSON_TASKS[url]
+                task.cancel()
+
+
+def _forget_failed_fetch(url: str, task: "asyncio.Task[dict]") -> None:
+    """Drop failed fetches from the memo so a later caller can retry."""
+    if _JSON_TASKS.get(url) is task and (
+        task.cancelled() or task.exception() is not None
+    ):
+        del _JSON_TASKS[url]
+
+
+async def _afetch_json_cached(
+    session: aiohttp.ClientSession, url: str, limit: asyncio.Semaphore
+) -> dict:
+    """afetch_json() body: serve from the disk cache, else fetch and cache."""
+    cache_path = CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < CACHE_TTL:
+            return json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        pass  # Missing or corrupt cache entry: fetch it again
+
+    # Retry transient failures like the Retry on _SESSION does, so a flaky
+    # high-priority version isn't replaced by a worse catalog's data
+    for attempt in range(HTTP_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        last_attempt = attempt == HTTP_RETRIES
+        try:
+            async with limit, session.get(url) as resp:
+                if resp.status in RETRY_STATUSES and not last_attempt:
+                    continue
+                resp.raise_for_status()
+                body = await resp.read()
+                break
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            if last_attempt:
+                raise
+
+    data = json_loads(body)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(body)
+    return data
 
 
 def get_all_events() -> dict[str, list[dict]]:
@@ -62,212 +231,459 @@ def get_all_events() -> dict[str, list[dict]]:
     print("Fetching event catalog from GWOSC...")
     data = fetch_json(GWOSC_API)
 
-    grouped: dict[str, list[dict]] = {}
+    # Collect (catalog priority, entry) pairs so the priority is looked up once
+    ranked: dict[str, list[tuple[int, dict]]] = {}
     for _key, entry in data["events"].items():
         name = entry.get("commonName", "")
         if not name:
             continue
-        if name not in grouped:
-            grouped[name] = []
-        grouped[name].append(entry)
+        if name not in ranked:
+            ranked[name] = []
+        priority = CATALOG_PRIORITY.get(entry.get("catalog.shortName", ""), 0)
+        ranked[name].append((priority, entry))
 
     # Sort each group by catalog priority (highest first)
-    for name in grouped:
-        grouped[name].sort(
-            key=lambda e: CATALOG_PRIORITY.get(e.get("catalog.shortName", ""), 0),
-            reverse=True,
-        )
+    by_priority = itemgetter(0)
+    grouped: dict[str, list[dict]] = {
+        name: [entry for _priority, entry in sorted(pairs, key=by_priority, reverse=True)]
+        for name, pairs in ranked.items()
+    }
 
     print(f"Found {len(grouped)} unique events")
     return grouped
 
 
-def get_strain_urls(event_versions: list[dict]) -> tuple[dict[str, str], float]:
+async def get_strain_urls(
+    session: aiohttp.ClientSession,
+    event_versions: list[dict],
+    limit: asyncio.Semaphore,
+) -> tuple[dict[str, str], float]:
     """
-    Get 4kHz HDF5 strain URLs for each detector.
-    Tries each catalog version (best first) until strain data is found.
-    Returns (detector_urls, gps_start).
+    Get HDF5 strain URLs at SAMPLE_RATE/DURATION for each detector.
+    Fetches every catalog version's details concurrently, then takes the
+    best version (by catalog priority) that has strain data, without
+    waiting for lower-priority versions.
+    Returns (detector_urls, gps_start). Raises RuntimeError if no version
+    has strain data and any detail fetch failed.
     """
-    for event in event_versions:
-        jsonurl = event.get("jsonurl")
-        if not jsonurl:
-            continue
-
-        try:
-            detail = fetch_json(jsonurl)
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            continue
+    versions = [event for event in event_versions if event.get("jsonurl")]
+    tasks = [
+        asyncio.ensure_future(afetch_json(session, event["jsonurl"], limit))
+        for event in versions
+    ]
+    failure: tuple[str, Exception] | None = None
 
-        # GWOSC event detail wraps data in events -> {key} -> strain
-        strain_entries: list[dict] = []
-        if "events" in detail:
-            for _key, event_data in detail["events"].items():
-                if isinstance(event_data, dict) and "strain" in event_data:
-                    strain_entries = event_data.get("strain", [])
-                    break
+    # We want HDF5 files at the configured sample rate and duration
+    wanted = (SAMPLE_RATE, "hdf5", DURATION)
 
-        if not strain_entries:
-            continue
+    try:
+        for event, task in zip(versions, tasks):
+            try:
+                detail = await task
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # Fall back to lower-priority versions, but remember the
+                # failure so it isn't mistaken for "no strain data"
+                if failure is None:
+                    failure = (event["jsonurl"], e)
+                continue
+
+            # GWOSC event detail wraps data in events -> {key} -> strain
+            strain_entries: list[dict] = []
+            if "events" in detail:
+                for _key, event_data in detail["events"].items():
+                    if isinstance(event_data, dict) and "strain" in event_data:
+                        strain_entries = event_data.get("strain", [])
+                        break
 
-        urls: dict[str, str] = {}
-        for s in strain_entries:
-            detector = s.get("detector", "")
-            sample_rate = s.get("sampling_rate", 0)
-            fmt = s.get("format", "")
-            duration = s.get("duration", 0)
-
-            # We want 4096 Hz, HDF5, 32-second files
-            if (
-                detector in DETECTORS
-                and sample_rate == SAMPLE_RATE
-                and fmt == "hdf5"
-                and duration == DURATION
-            ):
-                urls[detector] = s["url"]
-
-        if urls:
-            gps = event.get("GPS", 0)
-            return urls, gps
+            urls: dict[str, str] = {}
+            for s in strain_entries:
+                if (
+                    (s.get("sampling_rate"), s.get("format"), s.get("duration")) == wanted
+                    and s.get("detector") in _DETECTOR_SET
+                ):
+                    urls[s["detector"]] = s["url"]
+                    if len(urls) == len(_DETECTOR_SET):
+                        break
 
+            if urls:
+                gps = event.get("GPS", 0)
+                return urls, gps
+    finally:
+        # Drop lower-priority fetches that are no longer needed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if failure is not None:
+        url, e = failure
+        raise RuntimeError(f"could not fetch {url}: {e or type(e).__name__}") from e
     return {}, 0
 
 
-def download_hdf5(url: str) -> str:
-    """Download an HDF5 file to a temp path. Returns the temp file path."""
-    req = urllib.request.Request(url, headers={"User-Agent": "WarpLab/1.0"})
-    fd, tmp_path = tempfile.mkstemp(suffix=".hdf5")
-    try:
-        with urllib.request.urlopen(req, timeout=120) as resp:
-            with os.fdopen(fd, "wb") as f:
-                while True:
-                    chunk = resp.read(65536)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-    except Exception:
-        try:
-            os.close(fd)
-        except OSError:
-            pass
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        raise
-    return tmp_path
+def _read_strain(dset: h5py.Dataset) -> np.ndarray:
+    """Read a strain dataset as float32."""
+    # A dataset stored as one unfiltered chunk can be read as raw bytes,
+    # skipping HDF5's selection and conversion machinery
+    if dset.chunks == dset.shape and dset.id.get_create_plist().get_nfilters() == 0:
+        _filter_mask, raw = dset.id.read_direct_chunk((0,) * dset.ndim)
+        return np.frombuffer(raw, dtype=dset.dtype).astype(np.float32)
 
+    # Otherwise let HDF5 convert float64 -> float32 during the read, so the
+    # full float64 array is never materialized
+    return dset.astype(np.float32)[:]
 
-def extract_strain(hdf5_path: str) -> tuple[np.ndarray, int, float]:
+
+def fetch_and_extract(url: str) -> tuple[np.ndarray, int, float]:
     """
-    Extract strain data from a GWOSC HDF5 file.
+    Download a GWOSC HDF5 file into memory and extract its strain data.
     Returns (strain_array, sample_rate, gps_start).
     """
-    with h5py.File(hdf5_path, "r") as f:
-        strain = f["strain"]["Strain"][:]
+    buf = io.BytesIO()
+    with _SESSION.get(url, stream=True, timeout=120) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True  # Undo any Content-Encoding, as iter_content() would
+        shutil.copyfileobj(resp.raw, buf, length=1 << 20)
+    buf.seek(0)
+
+    with h5py.File(buf, "r") as f:
+        strain_ds = f["strain"]["Strain"]
+        strain = _read_strain(strain_ds)
         meta = f["meta"]
         gps_start = float(meta["GPSstart"][()])
         sr = SAMPLE_RATE
 
         # Try to get sample rate from strain dataset attributes
-        strain_ds = f["strain"]["Strain"]
         if "Npoints" in strain_ds.attrs and "Duration" in meta.attrs:
             npoints = int(strain_ds.attrs["Npoints"])
             dur = float(meta.attrs["Duration"])
             if dur > 0:
                 sr = int(npoints / dur)
 
-        return strain.astype(np.float32), sr, gps_start
+        return strain, sr, gps_start
+
+
+def write_manifest(path: Path, manifest: dict) -> None:
+    """Write the manifest atomically, so an interrupted run never truncates it."""
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(json_dumps(manifest))
+    os.replace(tmp_path, path)
 
 
 def save_bin(data: np.ndarray, path: Path) -> None:
     """Save a Float32Array as a raw binary file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    data.astype(np.float32).tofile(str(path))
+    # No-op (no copy) when data is already contiguous float32
+    np.ascontiguousarray(data, dtype=np.float32).tofile(str(path))
+
+
+def save_zst(data: np.ndarray, path: Path) -> None:
+    """Save a Float32Array as a zstd-compressed binary file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Compressors aren't thread-safe, so each call gets its own
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, write_checksum=True)
+    path.write_bytes(compressor.compress(np.ascontiguousarray(data, dtype=np.float32)))
+
+
+def expected_samples() -> int:
+    """Number of samples in a complete strain segment."""
+    return SAMPLE_RATE * DURATION
+
+
+def strain_suffix() -> str:
+    """File suffix for strain files in the configured output format."""
+    return ".bin.zst" if COMPRESSION == "zstd" else ".bin"
+
 
+def manifest_entry(detectors: list[str], gps_start: float) -> dict:
+    """Build the manifest entry describing one event's strain files."""
+    entry = {
+        "detectors": detectors,
+        "sampleRate": SAMPLE_RATE,
+        "gpsStart": gps_start,
+        "duration": DURATION,
+    }
+    if COMPRESSION != "none":
+        entry["compression"] = COMPRESSION
+    return entry
 
-def process_event(name: str, event_versions: list[dict], manifest: dict) -> bool:
+
+def _finite_ends(strain: np.ndarray) -> bool:
+    """Whether the first and last samples are finite."""
+    return bool(np.isfinite(strain[0]) and np.isfinite(strain[-1]))
+
+
+def _is_complete(path: str, size: int) -> bool:
+    """Whether a strain file holds exactly one complete segment."""
+    bin_size = expected_samples() * np.dtype(np.float32).itemsize
+    if COMPRESSION == "zstd":
+        # Decompressing ~0.5 MB also verifies the frame checksum
+        try:
+            with open(path, "rb") as f:
+                return len(zstandard.ZstdDecompressor().decompress(f.read())) == bin_size
+        except zstandard.ZstdError:
+            return False
+    if size != bin_size:
+        return False
+    # Complete Float32Array: also check the ends hold real samples, which
+    # catches zero-filled or garbage tails. memmap only reads those two pages
+    strain = np.memmap(path, dtype=np.float32, mode="r")
+    return len(strain) == expected_samples() and _finite_ends(strain)
+
+
+def completed_detectors(event_dir: Path) -> list[str]:
+    """Detectors with a complete strain file in event_dir, sorted."""
+    suffix = strain_suffix()
+    with os.scandir(event_dir) as it:
+        return sorted(
+            entry.name.removesuffix(suffix)
+            for entry in it
+            if entry.name.endswith(suffix)
+            and _is_complete(entry.path, entry.stat().st_size)
+        )
+
+
+def scan_completed() -> dict[str, list[str]]:
+    """
+    Scan OUTPUT_DIR once for events that are already downloaded.
+    Returns {eventName: detectors}.
+    """
+    completed: dict[str, list[str]] = {}
+    with os.scandir(OUTPUT_DIR) as it:
+        for entry in it:
+            if entry.is_dir():
+                detectors = completed_detectors(Path(entry.path))
+                if detectors:
+                    completed[entry.name] = detectors
+    return completed
+
+
+def strain_data_size(path: "str | Path") -> int:
+    """Total size in bytes of the strain files (.bin or .bin.zst) under path."""
+    total = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                total += strain_data_size(entry.path)
+            elif entry.name.endswith((".bin", ".bin.zst")):
+                total += entry.stat().st_size
+    return total
+
+
+def _fetch_detector(detector: str, url: str, event_dir: Path) -> float:
+    """Download, extract and save one detector's strain. Returns gps_start."""
+    strain, sr, gps = fetch_and_extract(url)
+    # The .bin files are headerless, so the manifest's sampleRate/duration
+    # must describe every file exactly
+    if sr != SAMPLE_RATE or len(strain) != expected_samples():
+        raise ValueError(
+            f"expected {expected_samples()} samples at {SAMPLE_RATE} Hz, "
+            f"got {len(strain)} at {sr} Hz"
+        )
+    # Same check the re-scan applies, so a saved file is always accepted later
+    if not _finite_ends(strain):
+        raise ValueError("strain starts or ends with non-finite samples")
+    path = event_dir / f"{detector}{strain_suffix()}"
+    if COMPRESSION == "zstd":
+        save_zst(strain, path)
+    else:
+        save_bin(strain, path)
+    return gps
+
+
+async def process_event(
+    name: str,
+    event_versions: list[dict],
+    manifest: dict,
+    session: aiohttp.ClientSession,
+    limit: asyncio.Semaphore,
+    pool: ThreadPoolExecutor,
+) -> bool:
     """Process a single event. Returns True if any data was saved."""
     event_dir = OUTPUT_DIR / name
 
-    # Check if already processed (idempotent)
-    if event_dir.exists() and any(event_dir.glob("*.bin")):
-        detectors = []
-        for bin_file in sorted(event_dir.glob("*.bin")):
-            det = bin_file.stem
-            size = bin_file.stat().st_size
-            if size > 0 and size % 4 == 0:  # Valid Float32Array
-                detectors.append(det)
-
-        if detectors:
-            gps = event_versions[0].get("GPS", 0) if event_versions else 0
-            manifest[name] = {
-                "detectors": detectors,
-                "sampleRate": SAMPLE_RATE,
-                "gpsStart": gps,
-                "duration": DURATION,
-            }
-            print(f"  {name}: already exists ({', '.join(detectors)}), skipping")
-            return True
-
     # Get strain URLs (tries each catalog version)
-    urls, gps_start = get_strain_urls(event_versions)
+    urls, gps_start = await get_strain_urls(session, event_versions, limit)
     if not urls:
-        print(f"  {name}: no 4kHz HDF5 strain data available, skipping")
+        tqdm.write(f"  {name}: no {SAMPLE_RATE} Hz HDF5 strain data available, skipping")
         return False
 
+    # Downloads are blocking, so they run on the shared thread pool
+    loop = asyncio.get_running_loop()
+    detectors = sorted(urls)
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _fetch_detector, detector, urls[detector], event_dir)
+            for detector in detectors
+        ),
+        return_exceptions=True,
+    )
+
     detectors_saved = []
+    for detector, result in zip(detectors, results):
+        if isinstance(result, Exception):
+            tqdm.write(f"  {name}/{detector}: FAILED: {result}")
+            continue
+        detectors_saved.append(detector)
+        gps_start = result
 
-    for detector, url in sorted(urls.items()):
-        try:
-            print(f"  {name}/{detector}: downloading...", end="", flush=True)
-            tmp_path = download_hdf5(url)
+    if detectors_saved:
+        manifest[name] = manifest_entry(detectors_saved, gps_start)
+        tqdm.write(f"  {name}: saved {', '.join(detectors_saved)}")
+        return True
+
+    return False
+
+
+# Signal that stopped the run; SIGINT unless the SIGTERM handler fired
+_STOP_SIGNAL = signal.SIGINT
 
-            try:
-                strain, sr, gps = extract_strain(tmp_path)
-                gps_start = gps
-                bin_path = event_dir / f"{detector}.bin"
-                save_bin(strain, bin_path)
-                detectors_saved.append(detector)
-                size_kb = bin_path.stat().st_size / 1024
-                print(f" OK ({len(strain)} samples, {size_kb:.0f} KB)")
-            finally:
-                os.unlink(tmp_path)
 
+def _stop_on_sigterm(task: asyncio.Task) -> None:
+    """Cancel the main task on SIGTERM, recording the signal for the exit code."""
+    global _STOP_SIGNAL
+    _STOP_SIGNAL = signal.SIGTERM
+    task.cancel()
+
+
+async def main_async(
+    events: dict[str, list[dict]],
+    manifest: dict,
+    manifest_path: Path,
+    workers: int = PER_HOST,
+    per_host: int = PER_HOST,
+) -> int:
+    """Process all events concurrently. Returns the number processed."""
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=per_host)
+    # Every fetch is queued up front, so the timeout must not count time
+    # spent waiting for a pooled connection: only connecting and reading
+    timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=DETAIL_TIMEOUT, sock_read=DETAIL_TIMEOUT
+    )
+    headers = {"User-Agent": USER_AGENT}
+    # All detail JSON comes from one host, so this matches the connector
+    limit = asyncio.Semaphore(per_host)
+
+    # Extra threads would only wait on the per-host connection cap
+    pool = ThreadPoolExecutor(max_workers=min(workers, per_host))
+    progress = tqdm(total=len(events), unit="event")
+
+    async def run(name: str, versions: list[dict]) -> bool:
+        try:
+            ok = await process_event(name, versions, manifest, session, limit, pool)
         except Exception as e:
-            print(f" FAILED: {e}")
+            tqdm.write(f"  {name}: ERROR: {e}")
+            ok = False
+        progress.update()
+        if progress.n % MANIFEST_FLUSH_EVERY == 0:
+            write_manifest(manifest_path, manifest)
+        return ok
+
+    # Stop on SIGTERM the same way asyncio.run() stops on Ctrl-C
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, _stop_on_sigterm, asyncio.current_task()
+        )
+    except NotImplementedError:  # Windows event loops
+        pass
 
-    if detectors_saved:
-        manifest[name] = {
-            "detectors": sorted(detectors_saved),
-            "sampleRate": SAMPLE_RATE,
-            "gpsStart": gps_start,
-            "duration": DURATION,
-        }
-        return True
+    try:
+        # trust_env: honour HTTPS_PROXY etc. like the requests session does
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers=headers, trust_env=True
+        ) as session:
+            results = await asyncio.gather(
+                *(run(name, versions) for name, versions in sorted(events.items()))
+            )
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        # Save progress right away: a supervisor may SIGKILL long before
+        # in-flight downloads (120 s timeout, plus retries) finish
+        write_manifest(manifest_path, manifest)
+        raise
+    finally:
+        # Drop queued downloads and don't block on in-flight ones; on a
+        # normal finish every download is already done
+        pool.shutdown(wait=False, cancel_futures=True)
+        progress.close()
 
-    return False
+    return sum(results)
 
 
-def main():
-    single_event = None
-    list_only = False
+def _positive_int(value: str) -> int:
+    """argparse type for integer options that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
 
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--list":
-            list_only = True
-        else:
-            single_event = sys.argv[1]
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Download LIGO/Virgo strain data from GWOSC."
+    )
+    parser.add_argument("event", nargs="?", help="download a single event")
+    parser.add_argument(
+        "--list", action="store_true", help="list available events and exit"
+    )
+    parser.add_argument(
+        "--workers", type=_positive_int, metavar="N",
+        help=(
+            "HDF5 downloads in flight at once, capped at --per-host since "
+            "every file comes from one host (default: --per-host)"
+        ),
+    )
+    parser.add_argument(
+        "--per-host", type=_positive_int, metavar="N", default=PER_HOST,
+        help=f"connections per host (default {PER_HOST})",
+    )
+    parser.add_argument(
+        "--sample-rate", type=_positive_int, metavar="HZ", default=SAMPLE_RATE,
+        help=f"strain sample rate in Hz (default {SAMPLE_RATE})",
+    )
+    parser.add_argument(
+        "--duration", type=_positive_int, metavar="S", default=DURATION,
+        help=(
+            "strain segment length in seconds; each segment's HDF5 file is "
+            f"held in memory while extracted (default {DURATION})"
+        ),
+    )
+    parser.add_argument(
+        "--compress", choices=["none", "zstd"], default=COMPRESSION,
+        help=f"output compression (default {COMPRESSION})",
+    )
+    return parser.parse_args()
+
+
+def main():
+    global SAMPLE_RATE, DURATION, COMPRESSION
+
+    args = parse_args()
+    if args.compress == "zstd" and zstandard is None:
+        print("Error: --compress zstd requires the zstandard package")
+        sys.exit(1)
+    SAMPLE_RATE = args.sample_rate
+    DURATION = args.duration
+    COMPRESSION = args.compress
+    if args.workers is None:
+        args.workers = args.per_host
+    # Every HDF5 file comes from the same host, so the pool only needs as
+    # many connections as there can be downloads in flight
+    configure_session(min(args.workers, args.per_host))
 
     events = get_all_events()
 
-    if list_only:
+    if args.list:
         for name in sorted(events.keys()):
             print(name)
         return
 
-    if single_event:
-        if single_event not in events:
-            print(f"Error: Event '{single_event}' not found in catalog")
+    if args.event:
+        if args.event not in events:
+            print(f"Error: Event '{args.event}' not found in catalog")
             sys.exit(1)
-        events = {single_event: events[single_event]}
+        events = {args.event: events[args.event]}
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -275,30 +691,40 @@ def main():
     manifest_path = OUTPUT_DIR / "manifest.json"
     manifest: dict = {}
     if manifest_path.exists():
-        with open(manifest_path) as f:
-            manifest = json.load(f)
+        manifest = json_loads(manifest_path.read_bytes())
 
     total = len(events)
-    success = 0
-    for i, (name, versions) in enumerate(sorted(events.items()), 1):
-        print(f"[{i}/{total}] Processing {name}...")
-        try:
-            if process_event(name, versions, manifest):
-                success += 1
-        except Exception as e:
-            print(f"  ERROR: {e}")
+
+    # Events already on disk (idempotent) need no network at all
+    completed = scan_completed()
+    done = sorted(events.keys() & completed.keys())
+    for name in done:
+        versions = events.pop(name)
+        gps = versions[0].get("GPS", 0) if versions else 0
+        manifest[name] = manifest_entry(completed[name], gps)
+    if done:
+        print(f"{len(done)} events already downloaded, skipping")
+
+    try:
+        success = len(done) + asyncio.run(
+            main_async(events, manifest, manifest_path, args.workers, args.per_host)
+        )
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        write_manifest(manifest_path, manifest)
+        print(
+            f"\nInterrupted by {_STOP_SIGNAL.name}: "
+            f"manifest saved ({len(manifest)} events)"
+        )
+        sys.exit(128 + _STOP_SIGNAL)  # 130 for SIGINT, 143 for SIGTERM
 
     # Write manifest
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2, sort_keys=True)
+    write_manifest(manifest_path, manifest)
 
     print(f"\nDone: {success}/{total} events processed")
     print(f"Manifest: {manifest_path}")
 
     # Calculate total size
-    total_size = sum(
-        p.stat().st_size for p in OUTPUT_DIR.rglob("*.bin")
-    )
+    total_size = strain_data_size(OUTPUT_DIR)
     print(f"Total strain data: {total_size / (1024 * 1024):.1f} MB")
 
 